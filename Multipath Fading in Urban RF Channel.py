@@ -26,6 +26,60 @@ def multipath_fading(num_paths, distance):
 
     return t * 1e6, 20 * np.log10(np.abs(signal))
 
+# ----- Wideband Tapped-Delay-Line Mode -----
+subcarrier_spacing = 312.5e3  # Wi-Fi OFDM subcarrier spacing (Hz)
+bandwidth_init = 20e6  # 20 MHz channel
+num_snapshots = 2000  # channel realizations evaluated at once
+
+# Wideband channel: every snapshot's paths become taps of an impulse response
+# sampled at 1/bandwidth, and the FFT of that gives the response across the
+# OFDM subcarriers. All snapshots are handled as one (snapshots x taps) array.
+def wideband_channel(num_paths, distance, bandwidth, snapshots=num_snapshots):
+    rng = np.random.RandomState(42)
+    path_amplitudes = rng.rayleigh(scale=0.5, size=(snapshots, num_paths))
+    path_phases = rng.uniform(0, 2 * np.pi, (snapshots, num_paths))
+    path_delays = rng.uniform(0, distance / c, (snapshots, num_paths))
+
+    num_subcarriers = int(round(bandwidth / subcarrier_spacing))
+    taps = np.rint(path_delays * bandwidth).astype(int)
+    if taps.max() >= num_subcarriers:
+        raise ValueError("path delays exceed the OFDM symbol length (1 / subcarrier spacing)")
+
+    # Tapped delay line: paths falling in the same tap add coherently.
+    gains = path_amplitudes * np.exp(1j * (path_phases - 2 * np.pi * frequency * path_delays))
+    index = (np.arange(snapshots)[:, None] * num_subcarriers + taps).ravel()
+    size = snapshots * num_subcarriers
+    h = (np.bincount(index, gains.real.ravel(), size)
+         + 1j * np.bincount(index, gains.imag.ravel(), size)).reshape(snapshots, num_subcarriers)
+    H = np.fft.fftshift(np.fft.fft(h, axis=1), axes=1)
+    subcarrier_freqs = np.fft.fftshift(np.fft.fftfreq(num_subcarriers, 1 / bandwidth))
+
+    # Both metrics use the same tap-binned power delay profile |h|^2, i.e. the
+    # channel as resolved at this bandwidth (delays rounded to 1/bandwidth).
+    pdp = np.abs(h)**2
+    tap_delays = np.arange(num_subcarriers) / bandwidth
+    total_power = np.sum(pdp, axis=1)
+    mean_delay = pdp @ tap_delays / total_power
+    mean_sq_delay = pdp @ tap_delays**2 / total_power
+    rms_delay_spread = np.sqrt(np.maximum(mean_sq_delay - mean_delay**2, 0))
+
+    # Coherence bandwidth: frequency lag where the correlation of H(f) first
+    # drops below 0.5 (the correlation is the FFT of the PDP), linearly
+    # interpolated between subcarriers. Snapshots that never drop below 0.5
+    # within half the band are censored and returned as NaN.
+    correlation = np.abs(np.fft.fft(pdp, axis=1))
+    correlation = correlation[:, :num_subcarriers // 2 + 1] / correlation[:, :1]
+    below = correlation < 0.5
+    crossed = below.any(axis=1)
+    k = np.maximum(below.argmax(axis=1), 1)
+    rows = np.arange(snapshots)
+    r_before, r_after = correlation[rows, k - 1], correlation[rows, k]
+    with np.errstate(divide='ignore', invalid='ignore'):  # censored rows are masked below
+        lag = k - 1 + (r_before - 0.5) / (r_before - r_after)
+    coherence_bandwidth = np.where(crossed, lag * subcarrier_spacing, np.nan)
+
+    return subcarrier_freqs / 1e6, H, rms_delay_spread, coherence_bandwidth
+
 # Plot setup
 fig, ax = plt.subplots()
 plt.subplots_adjust(bottom=0.3)
@@ -45,6 +99,40 @@ ax_distance = plt.axes([0.25, 0.1, 0.65, 0.03])
 slider_paths = Slider(ax_paths, 'Num Paths', 1, 20, valinit=num_paths_init, valstep=1)
 slider_distance = Slider(ax_distance, 'Distance (m)', 10, 500, valinit=distance_init)
 
+# Wideband plot setup
+fig_wb, (ax_wb, ax_cdf) = plt.subplots(2, 1, figsize=(8, 8))
+plt.subplots_adjust(bottom=0.2, hspace=0.4)
+
+def wideband_stats(num_paths, distance, bandwidth):
+    f_sub, H, tau_rms, b_coh = wideband_channel(num_paths, distance, bandwidth)
+    gain_db = 20 * np.log10(np.abs(H) + 1e-12)
+    # Subcarrier gain relative to each snapshot's mean power, pooled over all snapshots
+    rel_db = np.sort((gain_db - 10 * np.log10(np.mean(np.abs(H)**2, axis=1, keepdims=True))).ravel())
+    cdf = np.arange(1, rel_db.size + 1) / rel_db.size
+    censored = np.count_nonzero(np.isnan(b_coh))
+    mean_b_coh = np.nanmean(b_coh) / 1e6 if censored < b_coh.size else np.nan
+    title = ('Mean RMS delay spread = {:.0f} ns, mean coherence BW = {:.2f} MHz\n'
+             '({} of {} snapshots stay above 0.5 correlation over B/2 = {:.0f} MHz)').format(
+        np.mean(tau_rms) * 1e9, mean_b_coh, censored, b_coh.size, bandwidth / 2e6)
+    return f_sub, gain_db[0], rel_db, cdf, title
+
+f_sub, gain_db, rel_db, cdf, title = wideband_stats(num_paths_init, distance_init, bandwidth_init)
+line_wb, = ax_wb.plot(f_sub, gain_db, label='|H(f)| (snapshot 1)')
+ax_wb.set_xlabel('Subcarrier Offset (MHz)')
+ax_wb.set_ylabel('Gain (dB)')
+ax_wb.set_title(title, fontsize=10)
+ax_wb.grid(True)
+ax_wb.legend()
+
+line_cdf, = ax_cdf.semilogy(rel_db, cdf)
+ax_cdf.set_xlabel('Subcarrier Gain Relative to Mean (dB)')
+ax_cdf.set_ylabel('CDF')
+ax_cdf.set_title('OFDM Subcarrier Fading ({} snapshots)'.format(num_snapshots))
+ax_cdf.grid(True, which='both', linestyle='--', linewidth=0.5)
+
+ax_bandwidth = fig_wb.add_axes([0.25, 0.05, 0.65, 0.03])
+slider_bandwidth = Slider(ax_bandwidth, 'Bandwidth (MHz)', 20, 160, valinit=bandwidth_init / 1e6, valstep=20)
+
 # Update function
 def update(val):
     num_paths = int(slider_paths.val)
@@ -54,8 +142,23 @@ def update(val):
     ax.relim()
     ax.autoscale_view()
     fig.canvas.draw_idle()
+    update_wideband(val)
+
+def update_wideband(val):
+    num_paths = int(slider_paths.val)
+    distance = slider_distance.val
+    bandwidth = slider_bandwidth.val * 1e6
+    f_sub, gain_db, rel_db, cdf, title = wideband_stats(num_paths, distance, bandwidth)
+    line_wb.set_data(f_sub, gain_db)
+    line_cdf.set_data(rel_db, cdf)
+    ax_wb.set_title(title, fontsize=10)
+    for a in (ax_wb, ax_cdf):
+        a.relim()
+        a.autoscale_view()
+    fig_wb.canvas.draw_idle()
 
 slider_paths.on_changed(update)
 slider_distance.on_changed(update)
+slider_bandwidth.on_changed(update_wideband)
 
 plt.show()
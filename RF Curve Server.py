@@ -0,0 +1,684 @@
+"""
+Local asyncio server that streams the RF curves to browser clients.
+
+Instead of every student running a Tk window, one box runs this script and
+everybody points a browser at it. Clients send small JSON parameter messages
+over a WebSocket and get the computed curves back as compact float32 arrays.
+
+    python "RF Curve Server.py" serve --port 8765
+    python "RF Curve Server.py" bench --clients 50 --requests 200
+
+Only numpy and the standard library are needed (the WebSocket framing is done
+by hand on top of asyncio streams).
+
+Message from client (text frame):
+    {"id": 7, "kernel": "fspl", "params": {"frequency": 2.4e9}}
+
+Reply (binary frame, little endian, every field 4 bytes so the float32 data
+stays aligned for a JS Float32Array):
+    uint32 id | uint32 n_arrays | n_arrays x uint32 length | float32 data...
+
+Errors come back as a text frame: {"id": 7, "error": "..."}
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import struct
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+# ----- Constants -----
+c = 3e8                     # Speed of light (m/s)
+mu_0 = 4 * np.pi * 1e-7     # Permeability of free space (H/m)
+Z0 = 50                     # Characteristic impedance (Ohms)
+
+# ----- Server Tuning -----
+CACHE_BYTES = 256 * 2**20   # total size of encoded results kept in the shared cache
+HEAVY_POINTS = 20000        # requests with more points than this go to the worker pool
+MAX_POINTS = 200000         # hard cap on points per request
+MAX_PATHS = 1000            # hard cap on multipath num_paths
+MAX_WORK = 10**7            # hard cap on multipath points x num_paths
+CHUNK = 2**18               # (points x paths) elements evaluated at a time by multipath_fading
+OUTBOX_SIZE = 8             # curve replies queued per client before the oldest is dropped
+MAX_BACKLOG = 64            # error frames queued per client before it is disconnected
+MAX_INFLIGHT = 4            # requests computed concurrently per client
+MAX_MESSAGE = 64 * 1024     # largest client message accepted (bytes)
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+# ----- Kernels -----
+# Same models as the individual visualization scripts, but every kernel takes
+# its parameters as keyword arguments and returns a tuple of 1-D arrays
+# (x first, then one or more y curves).
+
+def fspl(distance_max, frequency, points):
+    distance = np.linspace(1, distance_max, points)
+    return distance, 20 * np.log10(distance) + 20 * np.log10(frequency) - 147.55
+
+
+def skin_depth(conductivity, f_min, f_max, points):
+    frequency = np.logspace(np.log10(f_min), np.log10(f_max), points)
+    omega = 2 * np.pi * frequency
+    return frequency, np.sqrt(2 / (mu_0 * conductivity * omega))
+
+
+def shielding(sigma, mu_r, thickness, points):
+    frequency = np.logspace(3, 9, points)
+    delta = np.sqrt(2 / (mu_0 * mu_r * sigma * 2 * np.pi * frequency))
+    return frequency, 8.7 * thickness / delta
+
+
+def standing_wave(distance, line_length, alpha, gamma, points):
+    x = np.linspace(0, distance, points)
+    k = 2 * np.pi / line_length
+    return x, np.exp(-alpha * x) * np.abs(1 + gamma * np.exp(-2j * k * x))
+
+
+def compute_waves(distance, line_length, alpha, R, X, points):
+    x = np.linspace(0, distance, points)
+    k = 2 * np.pi / line_length
+    ZL = R + 1j * X
+    Gamma = (ZL - Z0) / (ZL + Z0)
+    envelope = np.exp(-alpha * x)
+    V_total = envelope * np.abs(1 + Gamma * np.exp(-2j * k * x))
+    V_refl_real = envelope * np.abs(Gamma) * np.cos(2 * k * x + np.angle(Gamma))
+    return x, V_total, V_refl_real
+
+
+def antenna_pattern(pattern, freq, points):
+    theta = np.linspace(0, 2 * np.pi, points)
+    if pattern == 0:    # Isotropic
+        return theta, np.ones_like(theta)
+    if pattern == 1:    # Dipole
+        return theta, np.abs(np.sin(theta))
+    return theta, np.abs(np.cos(theta) * np.sin(2 * theta))**2   # Yagi-style
+
+
+def multipath_fading(num_paths, distance, frequency, points):
+    rng = np.random.RandomState(42)
+    num_paths = int(num_paths)
+    path_amplitudes = rng.rayleigh(scale=0.5, size=num_paths)
+    path_phases = rng.uniform(0, 2 * np.pi, num_paths)
+    path_delays = rng.uniform(0, distance / c, num_paths)
+
+    t = np.linspace(0, 1e-6, points)
+    signal = np.empty(points, dtype=complex)
+    # Sum over paths as a (points x paths) product instead of a Python loop,
+    # a block of time samples at a time so memory stays bounded.
+    step = max(1, CHUNK // num_paths)
+    for start in range(0, points, step):
+        block = t[start:start + step, None]
+        phase = 2 * np.pi * frequency * (block - path_delays) + path_phases
+        signal[start:start + step] = np.exp(1j * phase) @ path_amplitudes
+    return t * 1e6, 20 * np.log10(np.abs(signal))
+
+
+# name -> (function, default parameters)
+KERNELS = {
+    'fspl': (fspl, {'distance_max': 1000.0, 'frequency': 1e9, 'points': 1000}),
+    'skin_depth': (skin_depth, {'conductivity': 5.8e7, 'f_min': 1e3, 'f_max': 1e9, 'points': 500}),
+    'shielding': (shielding, {'sigma': 5e3, 'mu_r': 1.0, 'thickness': 0.001, 'points': 500}),
+    'standing_wave': (standing_wave, {'distance': 2.0, 'line_length': 1.0, 'alpha': 0.5,
+                                      'gamma': 0.5, 'points': 1000}),
+    'compute_waves': (compute_waves, {'distance': 2.0, 'line_length': 1.0, 'alpha': 0.5,
+                                      'R': 100.0, 'X': 40.0, 'points': 1000}),
+    'antenna': (antenna_pattern, {'pattern': 1, 'freq': 1e9, 'points': 360}),
+    'multipath': (multipath_fading, {'num_paths': 12, 'distance': 200.0,
+                                     'frequency': 2.4e9, 'points': 1000}),
+}
+
+# Parameters that are only meaningful (and numerically safe) when > 0.
+POSITIVE_PARAMS = {'frequency', 'freq', 'f_min', 'f_max', 'conductivity', 'sigma', 'mu_r', 'line_length'}
+
+
+def normalize(kernel, params):
+    """
+    Merge client parameters over the kernel defaults and turn them into a
+    hashable, canonical tuple so equal requests share one cache entry.
+    Raises ValueError for unknown kernels/parameters or bad values.
+    """
+    if not isinstance(kernel, str) or kernel not in KERNELS:
+        raise ValueError("unknown kernel {!r}".format(kernel))
+    if not isinstance(params, dict):
+        raise ValueError("params must be a JSON object")
+    func, defaults = KERNELS[kernel]
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise ValueError("unknown parameters: {}".format(", ".join(sorted(unknown))))
+
+    merged = {}
+    for name, default in defaults.items():
+        value = params.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError("parameter {!r} must be a number".format(name))
+        try:
+            value = float(value)
+        except OverflowError:
+            value = float('inf')
+        if not np.isfinite(value):
+            raise ValueError("parameter {!r} must be finite".format(name))
+        if name in POSITIVE_PARAMS and value <= 0:
+            raise ValueError("parameter {!r} must be positive".format(name))
+        if isinstance(default, int):
+            value = int(value)
+        merged[name] = value
+    if not 2 <= merged['points'] <= MAX_POINTS:
+        raise ValueError("points must be between 2 and {}".format(MAX_POINTS))
+    if kernel == 'multipath':
+        if not 1 <= merged['num_paths'] <= MAX_PATHS:
+            raise ValueError("num_paths must be between 1 and {}".format(MAX_PATHS))
+        if merged['points'] * merged['num_paths'] > MAX_WORK:
+            raise ValueError("points x num_paths must not exceed {}".format(MAX_WORK))
+    return kernel, tuple(sorted(merged.items()))
+
+
+def compute(key):
+    """
+    Run a kernel for a normalized key and encode the result as the reply body
+    (everything after the request id). Top-level so the process pool can
+    pickle it.
+    """
+    kernel, items = key
+    func, _ = KERNELS[kernel]
+    arrays = [np.ascontiguousarray(a, dtype='<f4') for a in func(**dict(items))]
+    header = struct.pack('<I{}I'.format(len(arrays)), len(arrays), *(a.size for a in arrays))
+    return header + b''.join(a.tobytes() for a in arrays)
+
+
+def decode_reply(payload):
+    """Split a binary reply into (request id, list of float32 arrays)."""
+    request_id, n_arrays = struct.unpack_from('<II', payload)
+    lengths = struct.unpack_from('<{}I'.format(n_arrays), payload, 8)
+    offset = 8 + 4 * n_arrays
+    arrays = []
+    for n in lengths:
+        arrays.append(np.frombuffer(payload, dtype='<f4', count=n, offset=offset))
+        offset += 4 * n
+    return request_id, arrays
+
+
+# ----- Shared Result Cache -----
+class ResultCache:
+    """
+    LRU cache of encoded results shared by every session, bounded by the total
+    size of the cached bodies. Concurrent requests for the same key wait on a
+    single computation instead of each running it. Heavy requests run in a
+    process pool, which is rebuilt if a worker dies.
+    """
+
+    def __init__(self, workers=None, max_bytes=CACHE_BYTES):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key):
+        body = self.entries.get(key)
+        if body is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+        future = self.pending.get(key)
+        if future is None:
+            self.misses += 1
+            future = asyncio.ensure_future(self._compute(key))
+            self.pending[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        return await asyncio.shield(future)
+
+    def _done(self, key, future):
+        self.pending.pop(key, None)
+        # Every waiter may have disconnected; retrieve the exception so asyncio
+        # doesn't log it as never retrieved.
+        if not future.cancelled():
+            future.exception()
+
+    async def _compute(self, key):
+        points = dict(key[1])['points']
+        if points > HEAVY_POINTS or key[0] == 'multipath':
+            loop = asyncio.get_running_loop()
+            pool = self.pool
+            try:
+                body = await loop.run_in_executor(pool, compute, key)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed by the OS); the executor is unusable
+                # from now on, so replace it for everyone else.
+                if self.pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers)
+                raise
+        else:
+            body = compute(key)   # cheap enough to run on the event loop
+        if len(body) <= self.max_bytes:
+            self.entries[key] = body
+            self.nbytes += len(body)
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= len(self.entries.popitem(last=False)[1])
+        return body
+
+
+# ----- WebSocket Framing -----
+def encode_frame(opcode, payload, mask=False):
+    """Build a single unfragmented frame. Clients must mask, servers must not."""
+    head = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    n = len(payload)
+    if n < 126:
+        head.append(mask_bit | n)
+    elif n < 1 << 16:
+        head.append(mask_bit | 126)
+        head += struct.pack('>H', n)
+    else:
+        head.append(mask_bit | 127)
+        head += struct.pack('>Q', n)
+    if mask:
+        key = os.urandom(4)
+        return bytes(head) + key + apply_mask(payload, key)
+    return bytes(head) + payload
+
+
+def apply_mask(payload, key):
+    if not payload:
+        return b''
+    data = np.frombuffer(payload, dtype=np.uint8)
+    keys = np.resize(np.frombuffer(key, dtype=np.uint8), data.size)
+    return (data ^ keys).tobytes()
+
+
+class ProtocolError(ValueError):
+    """A peer violated the WebSocket protocol; code is the close status to send."""
+
+    def __init__(self, message, code=1002):
+        super().__init__(message)
+        self.code = code
+
+
+class MessageReader:
+    """
+    Reads complete messages from a stream, joining fragments. Control frames
+    (close, ping, pong) may arrive between fragments; they are returned as they
+    arrive and the partial message is kept for the next call. Raises
+    ProtocolError for malformed or oversized frames.
+    """
+
+    def __init__(self, reader, limit=MAX_MESSAGE):
+        self.reader = reader
+        self.limit = limit
+        self.opcode, self.chunks, self.total = None, [], 0
+
+    async def read(self):
+        """Return the next (opcode, payload)."""
+        reader = self.reader
+        while True:
+            b1, b2 = await reader.readexactly(2)
+            fin, op = b1 & 0x80, b1 & 0x0F
+            n = b2 & 0x7F
+            if n == 126:
+                n, = struct.unpack('>H', await reader.readexactly(2))
+            elif n == 127:
+                n, = struct.unpack('>Q', await reader.readexactly(8))
+            key = await reader.readexactly(4) if b2 & 0x80 else None
+            if op >= 0x8:
+                if not fin or n > 125:
+                    raise ProtocolError("control frames must be unfragmented and at most 125 bytes")
+            else:
+                self.total += n
+                if self.total > self.limit:
+                    raise ProtocolError("message too large", 1009)
+            payload = await reader.readexactly(n)
+            if key is not None:
+                payload = apply_mask(payload, key)
+            if op >= 0x8:
+                return op, payload
+            if op != 0:
+                self.opcode = op
+            self.chunks.append(payload)
+            if fin:
+                message = self.opcode, b''.join(self.chunks)
+                self.opcode, self.chunks, self.total = None, [], 0
+                return message
+
+
+async def read_http_head(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    method, path, _ = lines[0].split(' ', 2)
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, path, headers
+
+
+# ----- Client Session -----
+class Session:
+    """
+    One connected browser. Incoming requests are computed concurrently (up to
+    MAX_INFLIGHT); replies go through an outbox drained by a dedicated writer
+    task. If a client reads slower than it asks, the oldest queued curve is
+    dropped once OUTBOX_SIZE of them are waiting, so a slow client only ever
+    sees its latest curves and never holds up anyone else. Error frames are
+    never dropped, but a client that lets more than MAX_BACKLOG of them pile up
+    is disconnected (1008); only the latest pong is kept.
+    """
+
+    def __init__(self, cache, reader, writer):
+        self.cache = cache
+        self.messages = MessageReader(reader)
+        self.writer = writer
+        self.outbox = deque()       # (is_result, frame)
+        self.queued_results = 0
+        self.pong = None
+        self.closing = False
+        self.ready = asyncio.Event()
+        self.inflight = asyncio.Semaphore(MAX_INFLIGHT)
+        self.tasks = set()
+        self.dropped = 0
+
+    def send(self, frame, result=False):
+        if self.closing:
+            return
+        if result:
+            if self.queued_results >= OUTBOX_SIZE:
+                for i, (is_result, _) in enumerate(self.outbox):
+                    if is_result:
+                        del self.outbox[i]
+                        break
+                self.dropped += 1
+            else:
+                self.queued_results += 1
+        elif len(self.outbox) - self.queued_results >= MAX_BACKLOG:
+            self.close(1008)
+            return
+        self.outbox.append((result, frame))
+        self.ready.set()
+
+    def send_pong(self, payload):
+        self.pong = payload
+        self.ready.set()
+
+    def close(self, code):
+        """Discard anything queued and send a close frame as the last frame."""
+        if self.closing:
+            return
+        self.closing = True
+        self.outbox.clear()
+        self.queued_results = 0
+        self.pong = None
+        self.outbox.append((False, encode_frame(0x8, struct.pack('>H', code))))
+        self.ready.set()
+
+    async def write_loop(self):
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            while self.outbox or self.pong is not None:
+                if self.pong is not None:
+                    frame, self.pong = encode_frame(0xA, self.pong), None
+                else:
+                    is_result, frame = self.outbox.popleft()
+                    self.queued_results -= is_result
+                self.writer.write(frame)
+                await self.writer.drain()
+            if self.closing:
+                return
+
+    async def handle(self, text):
+        request_id = None
+        try:
+            message = json.loads(text)
+            if not isinstance(message, dict):
+                raise ValueError("request must be a JSON object")
+            request_id = message.get('id', 0)
+            if isinstance(request_id, bool) or not isinstance(request_id, int):
+                request_id = None
+                raise ValueError("id must be an integer")
+            request_id &= 0xFFFFFFFF
+            key = normalize(message.get('kernel'), message.get('params', {}))
+            body = await self.cache.get(key)
+            self.send(encode_frame(0x2, struct.pack('<I', request_id) + body), result=True)
+        except Exception as exc:    # CancelledError is not an Exception, so cancellation still propagates
+            error = str(exc) or type(exc).__name__
+            self.send(encode_frame(0x1, json.dumps({'id': request_id, 'error': error}).encode()))
+        finally:
+            self.inflight.release()
+
+    async def run(self):
+        writer_task = asyncio.ensure_future(self.write_loop())
+        try:
+            while not self.closing:
+                opcode, payload = await self.messages.read()
+                if opcode == 0x8:       # close
+                    self.writer.write(encode_frame(0x8, payload[:2]))
+                    break
+                if opcode == 0x9:       # ping
+                    self.send_pong(payload)
+                elif opcode == 0x1:
+                    # Waiting here stops us reading the socket, which pushes
+                    # back on a client that floods requests.
+                    await self.inflight.acquire()
+                    task = asyncio.ensure_future(self.handle(payload.decode('utf-8', 'replace')))
+                    self.tasks.add(task)
+                    task.add_done_callback(self.tasks.discard)
+        except ProtocolError as exc:
+            self.close(exc.code)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            for task in list(self.tasks):
+                task.cancel()
+            if self.closing:
+                # Give the close frame a moment to go out to a slow reader.
+                await asyncio.wait({writer_task}, timeout=1.0)
+            writer_task.cancel()
+            await asyncio.gather(writer_task, *self.tasks, return_exceptions=True)
+
+
+# ----- HTTP / WebSocket Server -----
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>RF Curves</title></head>
+<body style="font-family: sans-serif">
+<select id="kernel"></select>
+<input id="params" size="80" value="{}">
+<canvas id="plot" width="900" height="450" style="display:block;border:1px solid #ccc"></canvas>
+<script>
+const ws = new WebSocket(`ws://${location.host}/ws`);
+ws.binaryType = 'arraybuffer';
+const kernel = document.getElementById('kernel');
+const params = document.getElementById('params');
+const canvas = document.getElementById('plot');
+let nextId = 0;
+fetch('/kernels').then(r => r.json()).then(k => {
+  for (const name in k) kernel.add(new Option(name, name));
+  kernel.onchange = () => { params.value = JSON.stringify(k[kernel.value]); request(); };
+  kernel.onchange();
+});
+function request() {
+  let p;
+  try { p = JSON.parse(params.value); } catch (e) { return; }
+  if (ws.readyState === 1) ws.send(JSON.stringify({id: ++nextId, kernel: kernel.value, params: p}));
+}
+params.oninput = request;
+ws.onopen = request;
+ws.onmessage = (ev) => {
+  if (typeof ev.data === 'string') { console.warn(ev.data); return; }
+  const head = new Uint32Array(ev.data, 0, 2);
+  const lengths = new Uint32Array(ev.data, 8, head[1]);
+  let offset = 8 + 4 * head[1];
+  const arrays = [];
+  for (const n of lengths) { arrays.push(new Float32Array(ev.data, offset, n)); offset += 4 * n; }
+  draw(arrays[0], arrays.slice(1));
+};
+function draw(x, ys) {
+  const g = canvas.getContext('2d');
+  g.clearRect(0, 0, canvas.width, canvas.height);
+  const finite = v => Number.isFinite(v);
+  const xs = x.filter(finite), all = ys.flatMap(y => Array.from(y).filter(finite));
+  const x0 = Math.min(...xs), x1 = Math.max(...xs);
+  const y0 = Math.min(...all), y1 = Math.max(...all);
+  const colors = ['#1f77b4', '#ff7f0e', '#2ca02c'];
+  ys.forEach((y, i) => {
+    g.strokeStyle = colors[i % colors.length];
+    g.beginPath();
+    for (let j = 0; j < x.length; j++) {
+      const px = (x[j] - x0) / (x1 - x0 || 1) * canvas.width;
+      const py = canvas.height - (y[j] - y0) / (y1 - y0 || 1) * canvas.height;
+      j ? g.lineTo(px, py) : g.moveTo(px, py);
+    }
+    g.stroke();
+  });
+}
+</script></body></html>
+"""
+
+
+def http_response(status, content_type, body):
+    head = "HTTP/1.1 {}\r\nContent-Type: {}\r\nContent-Length: {}\r\nConnection: close\r\n\r\n"
+    return head.format(status, content_type, len(body)).encode() + body
+
+
+class CurveServer:
+    def __init__(self, workers=None):
+        self.cache = ResultCache(workers)
+        self.sessions = set()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            method, path, headers = await read_http_head(reader)
+            if path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                accept = base64.b64encode(
+                    hashlib.sha1((headers['sec-websocket-key'] + WS_GUID).encode()).digest()).decode()
+                writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                              "Connection: Upgrade\r\nSec-WebSocket-Accept: {}\r\n\r\n").format(accept).encode())
+                session = Session(self.cache, reader, writer)
+                self.sessions.add(session)
+                try:
+                    await session.run()
+                    # Don't let a client that stopped reading hold the connection open.
+                    await asyncio.wait_for(writer.drain(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    writer.transport.abort()
+                finally:
+                    self.sessions.discard(session)
+                return
+            elif path == '/':
+                writer.write(http_response("200 OK", "text/html; charset=utf-8", PAGE.encode()))
+            elif path == '/kernels':
+                defaults = {name: spec[1] for name, spec in KERNELS.items()}
+                writer.write(http_response("200 OK", "application/json", json.dumps(defaults).encode()))
+            elif path == '/stats':
+                stats = {'sessions': len(self.sessions), 'cache_entries': len(self.cache.entries),
+                         'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses,
+                         'dropped_frames': sum(s.dropped for s in self.sessions)}
+                writer.write(http_response("200 OK", "application/json", json.dumps(stats).encode()))
+            else:
+                writer.write(http_response("404 Not Found", "text/plain", b"not found"))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print("Serving RF curves on http://{}:{}/".format(host, port))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.cache.pool.shutdown(cancel_futures=True)
+
+
+# ----- Benchmark Client -----
+async def connect(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(("GET /ws HTTP/1.1\r\nHost: {}:{}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  "Sec-WebSocket-Key: {}\r\nSec-WebSocket-Version: 13\r\n\r\n").format(host, port, key).encode())
+    head = await reader.readuntil(b'\r\n\r\n')
+    if b' 101 ' not in head.split(b'\r\n', 1)[0]:
+        raise ConnectionError("WebSocket handshake refused")
+    return reader, writer
+
+
+async def bench_client(host, port, n_requests, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await connect(host, port)
+    messages = MessageReader(reader, limit=1 << 30)
+    try:
+        for i in range(n_requests):
+            # A small pool of shared parameter values so the cache gets exercised
+            # the way a classroom moving the same sliders would.
+            kernel = rng.choice(list(KERNELS))
+            params = {'points': rng.choice([500, 1000, 50000])}
+            if kernel == 'fspl':
+                params['frequency'] = rng.choice([0.9e9, 1e9, 2.4e9, 5.8e9])
+            elif kernel == 'multipath':
+                params['num_paths'] = rng.randint(1, 20)
+            message = json.dumps({'id': i, 'kernel': kernel, 'params': params}).encode()
+            start = time.perf_counter()
+            writer.write(encode_frame(0x1, message, mask=True))
+            await writer.drain()
+            while True:
+                opcode, payload = await messages.read()
+                if opcode == 0x2 and decode_reply(payload)[0] == i:
+                    break
+                if opcode == 0x1:
+                    raise RuntimeError(payload.decode())
+            latencies.append(time.perf_counter() - start)
+        writer.write(encode_frame(0x8, struct.pack('>H', 1000), mask=True))
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def bench(host, port, clients, n_requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(bench_client(host, port, n_requests, latencies, seed)
+                           for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1e3
+    print("{} clients x {} requests in {:.2f} s ({:.0f} req/s)".format(
+        clients, n_requests, elapsed, len(lat) / elapsed))
+    print("latency ms: p50 = {:.2f}, p95 = {:.2f}, max = {:.2f}".format(
+        np.percentile(lat, 50), np.percentile(lat, 95), lat.max()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream RF visualization curves to browser clients.")
+    parser.add_argument('mode', choices=['serve', 'bench'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for heavy requests")
+    parser.add_argument('--clients', type=int, default=50, help="bench: concurrent clients")
+    parser.add_argument('--requests', type=int, default=100, help="bench: requests per client")
+    args = parser.parse_args()
+
+    if args.mode == 'serve':
+        try:
+            asyncio.run(CurveServer(args.workers).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(bench(args.host, args.port, args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import math                      # for mathematical constants
+import time                      # for timing the sweep
+import numpy as np               # for batched complex matrix math
+import matplotlib.pyplot as plt  # for plotting
+
+# --- Constants ---
+eo = 8.854e-12          # free space permittivity (F/m)
+muo = math.pi * 4e-7    # free space permeability (H/m)
+Z0 = 50                 # reference / system impedance (Ohms)
+
+# Every network section below is an array of 2x2 ABCD matrices with shape
+# (num_freqs, 2, 2), one matrix per frequency point. A lumped element with a
+# frequency-independent (scalar) value is a single (2, 2) matrix, which
+# broadcasts against the others. Cascading sections is a batched matrix
+# multiplication, so the only Python loop is over sections, never over
+# frequencies.
+
+
+def coax_params(a, b, er, sigd, sigc, freqs):
+    """
+    Distributed parameters of a coaxial line over a frequency vector
+    (same model as Distributed_params_coax).
+    Parameters:
+      a, b  : inner and outer radius (mm)
+      er    : relative permittivity of the dielectric
+      sigd  : dielectric conductivity (S/m)
+      sigc  : conductor conductivity (S/m)
+      freqs : frequency vector (Hz)
+    Returns R, L, G, C, gamma and the characteristic impedance Zc.
+    R, gamma and Zc are arrays over freqs; L, G and C are scalars.
+    """
+    omega = 2 * np.pi * freqs
+    L = muo * math.log(b / a) / (2 * math.pi)
+    G = 2 * math.pi * sigd / math.log(b / a)
+    C = 2 * math.pi * er * eo / math.log(b / a)
+    Rs = np.sqrt(np.pi * freqs * muo / sigc)
+    R = (1000 * ((1 / a) + (1 / b)) * Rs) / (2 * math.pi)
+    Z = R + 1j * omega * L
+    Y = G + 1j * omega * C
+    gamma = np.sqrt(Z * Y)
+    Zc = np.sqrt(Z / Y)
+    return R, L, G, C, gamma, Zc
+
+
+def abcd(A, B, C, D):
+    """Stack the four (broadcastable) entries into an array of shape (..., 2, 2)."""
+    A, B, C, D = np.broadcast_arrays(*(np.asarray(v, dtype=complex) for v in (A, B, C, D)))
+    return np.stack([np.stack([A, B], axis=-1), np.stack([C, D], axis=-1)], axis=-2)
+
+
+def line(gamma, Zc, length):
+    """
+    ABCD matrices of a transmission line section of the given length (m):
+         [[cosh(gl),     Zc sinh(gl)],
+          [sinh(gl)/Zc,  cosh(gl)   ]]
+    """
+    gl = gamma * length
+    ch, sh = np.cosh(gl), np.sinh(gl)
+    return abcd(ch, Zc * sh, sh / Zc, ch)
+
+
+def series(Z):
+    """ABCD matrices of a series impedance Z: [[1, Z], [0, 1]]."""
+    return abcd(1, Z, 0, 1)
+
+
+def shunt(Y):
+    """ABCD matrices of a shunt admittance Y: [[1, 0], [Y, 1]]."""
+    return abcd(1, 0, Y, 1)
+
+
+def cascade(sections):
+    """
+    Multiply a chain of sections (source side first) into one ABCD matrix
+    per frequency using batched matrix multiplication.
+    """
+    total = sections[0]
+    for section in sections[1:]:
+        total = np.matmul(total, section)
+    return total
+
+
+def abcd_to_s(M, z0=Z0):
+    """
+    Convert ABCD matrices to S-parameters referenced to a real impedance z0.
+    Returns an array of the same shape as M holding [[S11, S12], [S21, S22]].
+    """
+    A, B, C, D = M[..., 0, 0], M[..., 0, 1], M[..., 1, 0], M[..., 1, 1]
+    den = A + B / z0 + C * z0 + D
+    S11 = (A + B / z0 - C * z0 - D) / den
+    S12 = 2 * (A * D - B * C) / den
+    S21 = 2 / den
+    S22 = (-A + B / z0 - C * z0 + D) / den
+    return abcd(S11, S12, S21, S22)
+
+
+def input_impedance(M, ZL):
+    """Impedance seen looking into the network when port 2 is terminated in ZL."""
+    A, B, C, D = M[..., 0, 0], M[..., 0, 1], M[..., 1, 0], M[..., 1, 1]
+    return (A * ZL + B) / (C * ZL + D)
+
+
+def connector(freqs, Ls=0.5e-9, Rs=0.01, Cp=0.1e-12):
+    """
+    Lumped model of a connector or adapter: series R + L with a shunt C on
+    either side (a simple pi section).
+    """
+    omega = 2 * np.pi * freqs
+    half_shunt = shunt(1j * omega * Cp / 2)
+    return cascade([half_shunt, series(Rs + 1j * omega * Ls), half_shunt])
+
+
+def main():
+    # --- Step 1: Frequency sweep and cable parameters ---
+    freqs = np.linspace(1e6, 3e9, 100000)
+    # RG-58 style coax: 0.45 mm / 1.47 mm radii, PE dielectric, copper conductors.
+    R, L, G, C, gamma, Zc = coax_params(0.45, 1.47, 2.25, 1e-5, 5.8e7, freqs)
+
+    # Complex load (same default as the complex-load standing wave script).
+    ZL = 100.0 + 1j * 40.0
+
+    # --- Step 2: Build a cable run: connectors, patch cables and adapters ---
+    sections = [connector(freqs)]
+    for length in [0.5, 10.0, 0.3, 5.0, 1.0, 0.2, 15.0, 2.0]:
+        sections.append(line(gamma, Zc, length))
+        sections.append(connector(freqs))
+    print("Chain of {} sections over {} frequency points".format(len(sections), freqs.size))
+
+    # --- Step 3: Cascade and convert ---
+    start = time.perf_counter()
+    M = cascade(sections)
+    S = abcd_to_s(M)
+    Zin = input_impedance(M, ZL)
+    print("Solved in {:.3f} s".format(time.perf_counter() - start))
+
+    # --- Step 4: Plot ---
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
+    ax1.plot(freqs / 1e9, 20 * np.log10(np.abs(S[:, 0, 0])), label='|S11|')
+    ax1.plot(freqs / 1e9, 20 * np.log10(np.abs(S[:, 1, 0])), label='|S21|')
+    ax1.set_ylabel("Magnitude (dB)")
+    ax1.set_title("Cascaded Coax Run: S-Parameters ({} Ohm reference)".format(Z0))
+    ax1.grid(True, which="both", ls="--", lw=0.5)
+    ax1.legend()
+
+    ax2.plot(freqs / 1e9, Zin.real, label='Re{Zin}')
+    ax2.plot(freqs / 1e9, Zin.imag, label='Im{Zin}')
+    ax2.set_xlabel("Frequency (GHz)")
+    ax2.set_ylabel("Input Impedance (Ohms)")
+    ax2.set_title("Input Impedance with ZL = {:g} Ohms".format(ZL))
+    ax2.grid(True, which="both", ls="--", lw=0.5)
+    ax2.legend()
+    plt.show()
+
+if __name__ == "__main__":
+    main()